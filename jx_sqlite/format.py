@@ -23,10 +23,16 @@ from mo_dots import (
 )
 from mo_future import transpose
 from mo_logs import Log
+from mo_sqlite.stream import StreamResult
 
 
 def format_flat(result, query, index_to_columns):
+    """
+    :param result: Data FROM Sqlite.query(), OR StreamResult FROM Sqlite.query_stream()
+    :return: Data, OR StreamResult IF GIVEN ONE, AND THE FORMAT CAN BE EMITTED ROW-BY-ROW
+    """
     if query.format == "cube" or (not query.format and query.edges):
+        result = _materialize(result)
         column_names = [None] * (max(c.push_column_index for c in index_to_columns.values()) + 1)
         for c in index_to_columns.values():
             column_names[c.push_column_index] = c.push_column_name
@@ -143,27 +149,31 @@ def format_flat(result, query, index_to_columns):
         column_names = [None] * (max(c.push_column_index for c in index_to_columns.values()) + 1)
         for c in index_to_columns.values():
             column_names[c.push_column_index] = c.push_column_name
-        data = []
-        for d in result.data:
-            row = [None for _ in column_names]
-            for s in index_to_columns.values():
-                if s.push_column_child == ".":
-                    row[s.push_column_index] = s.pull(d)
-                elif s.num_push_columns:
-                    tuple_value = row[s.push_column_index]
-                    if tuple_value == None:
-                        tuple_value = row[s.push_column_index] = [None] * s.num_push_columns
-                    tuple_value[s.push_column_child] = s.pull(d)
-                elif row[s.push_column_index] == None:
-                    row[s.push_column_index] = Data()
-                    row[s.push_column_index][s.push_column_child] = s.pull(d)
-                else:
-                    row[s.push_column_index][s.push_column_child] = s.pull(d)
-            data.append(tuple(from_data(r) for r in row))
 
-        output = Data(meta={"format": "table"}, header=column_names, data=data)
+        def table_rows():
+            for d in result.data:
+                row = [None for _ in column_names]
+                for s in index_to_columns.values():
+                    if s.push_column_child == ".":
+                        row[s.push_column_index] = s.pull(d)
+                    elif s.num_push_columns:
+                        tuple_value = row[s.push_column_index]
+                        if tuple_value == None:
+                            tuple_value = row[s.push_column_index] = [None] * s.num_push_columns
+                        tuple_value[s.push_column_child] = s.pull(d)
+                    elif row[s.push_column_index] == None:
+                        row[s.push_column_index] = Data()
+                        row[s.push_column_index][s.push_column_child] = s.pull(d)
+                    else:
+                        row[s.push_column_index][s.push_column_child] = s.pull(d)
+                yield tuple(from_data(r) for r in row)
+
+        if isinstance(result, StreamResult):
+            return StreamResult(Data(format="table"), column_names, table_rows(), result)
+        output = Data(meta={"format": "table"}, header=column_names, data=list(table_rows()))
     elif query.format == "list" or (not query.edges and not query.groupby):
         if not query.edges and not query.groupby and any(s.aggregate is not NULL for s in query.select.terms):
+            result = _materialize(result)
             data = Data()
             for s in index_to_columns.values():
                 if not data[s.push_column_name][s.push_column_child]:
@@ -172,28 +182,39 @@ def format_flat(result, query, index_to_columns):
                     data[s.push_column_name][s.push_column_child] += [s.pull(result.data[0])]
             output = Data(meta={"format": "value"}, data=unwraplist(from_data(data)))
         else:
-            data = []
-            for record in result.data:
-                row = Data()
-                for c in index_to_columns.values():
-                    if c.num_push_columns:
-                        # APPEARS TO BE USED FOR PULLING TUPLES (GROUPBY?)
-                        tuple_value = row[c.push_list_name]
-                        if not tuple_value:
-                            tuple_value = row[c.push_list_name] = [None] * c.num_push_columns
-                        tuple_value[c.push_column_child] = c.pull(record)
-                    else:
-                        row[c.push_list_name][c.push_column_child] = c.pull(record)
 
-                data.append(row)
+            def list_rows():
+                for record in result.data:
+                    row = Data()
+                    for c in index_to_columns.values():
+                        if c.num_push_columns:
+                            # APPEARS TO BE USED FOR PULLING TUPLES (GROUPBY?)
+                            tuple_value = row[c.push_list_name]
+                            if not tuple_value:
+                                tuple_value = row[c.push_list_name] = [None] * c.num_push_columns
+                            tuple_value[c.push_column_child] = c.pull(record)
+                        else:
+                            row[c.push_list_name][c.push_column_child] = c.pull(record)
+                    yield row
 
-            output = Data(meta={"format": "list"}, data=data)
+            if isinstance(result, StreamResult):
+                return StreamResult(Data(format="list"), None, list_rows(), result)
+            output = Data(meta={"format": "list"}, data=list(list_rows()))
     else:
         Log.error("unknown format {format}", format=query.format)
 
     return output
 
 
+def _materialize(result):
+    """
+    FORMATS THAT NEED EVERY ROW BEFORE THE FIRST CAN BE EMITTED
+    """
+    if isinstance(result, StreamResult):
+        return Data(meta=result.meta, header=result.header, data=list(result.data))
+    return result
+
+
 def format_metadata(metadata, query):
     if query.format == "cube":
         num_rows = len(metadata)
@@ -213,6 +234,21 @@ def format_metadata(metadata, query):
 
 
 def format_deep(data, cols, query):
+    """
+    :param data: LIST OF DOCUMENTS, OR StreamResult OF DOCUMENTS
+    """
+    if isinstance(data, StreamResult):
+        if query.format == "table":
+            header = tuple(jx.sort(set(c.push_column_name for c in cols)))
+            if header == (".",):
+                return StreamResult(Data(format="table"), header, data.data, data)
+            locs = tuple(literal_field(h) for h in header)
+            rows = (tuple(d[l] for l in locs) for d in data.data)
+            return StreamResult(Data(format="table"), header, rows, data)
+        elif query.format != "cube":
+            return StreamResult(Data(format="list"), None, data.data, data)
+        data = list(data.data)
+
     if query.format == "cube":
         num_rows = len(data)
         header = tuple(jx.sort(set(c.push_column_name for c in cols)))
@@ -7,7 +7,13 @@
 #
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import is_dataclass
+from itertools import count
+from multiprocessing import get_context
+from time import time
 from typing import Dict, List
 from uuid import uuid4
 
@@ -21,7 +27,7 @@ from jx_sqlite.utils import (
     UID,
     typed_column,
 )
-from mo_sql.utils import untyped_column
+from mo_sql.utils import untyped_column, untype_field
 from mo_dots import (
     Data,
     concat_field,
@@ -59,13 +65,20 @@ from mo_sqlite import (
     SQL_DELETE,
     SQL_ON,
     SQL_COMMA,
+    SQL_IN,
+    SQL,
 )
 from mo_sqlite import (
     json_type_to_sqlite_type,
     quote_column,
     quote_value,
     sql_alias,
+    bind_value,
+    sql_insert_params,
+    SQL_BIND,
+    GUID_TABLE,
 )
+from mo_sqlite.shapes import ShapeCache
 from mo_times import Date
 
 
@@ -79,6 +92,185 @@ def insert(self, docs):
     return self._insert(doc_actions)
 
 
+@extend(Facts)
+def insert_stream(self, docs, batch_size=1000, max_bytes=None, single_transaction=False):
+    """
+    INSERT DOCUMENTS FROM ANY ITERABLE, ONE BOUNDED BATCH AT A TIME
+    :param docs: ITERABLE OF DOCUMENTS (GENERATORS ARE NOT MATERIALIZED)
+    :param batch_size: MAXIMUM NUMBER OF DOCUMENTS IN A BATCH
+    :param max_bytes: APPROXIMATE MAXIMUM (JSON) SIZE OF A BATCH
+    :param single_transaction: COMMIT ONCE AT THE END, INSTEAD OF AFTER EACH BATCH
+    :return: INGEST STATISTICS {"docs": int, "batches": int, "rows": {table: int}, "elapsed": seconds}
+    """
+    start = time()
+    stats = {"docs": 0, "batches": 0, "rows": {}, "elapsed": 0}
+
+    def batches():
+        batch, size = [], 0
+        for doc in docs:
+            batch.append(doc)
+            if max_bytes:
+                size += _approx_size(doc)
+            if len(batch) >= batch_size or (max_bytes and size >= max_bytes):
+                yield batch
+                batch, size = [], 0
+        if batch:
+            yield batch
+
+    def flush_all():
+        for batch in batches():
+            doc_actions = self.flatten_many(batch)
+            self._insert(doc_actions)
+            stats["docs"] += len(batch)
+            stats["batches"] += 1
+            rows = stats["rows"]
+            for table_name, insertion in doc_actions["insert"].items():
+                rows[table_name] = rows.get(table_name, 0) + len(insertion.rows)
+
+    if not self.namespace.find_snowflake(self.name):
+        self.container.get_or_create_facts(self.name)
+    if single_transaction:
+        with self.container.db.transaction():
+            flush_all()
+    else:
+        flush_all()
+    stats["elapsed"] = time() - start
+    return stats
+
+
+@extend(Facts)
+def insert_parallel(self, docs, processes=None, chunk_size=1000):
+    """
+    INSERT DOCUMENTS, FLATTENED BY A POOL OF PROCESSES
+    THE PROCESSES NEVER TOUCH THE DATABASE: SCHEMA CHANGES ARE MADE HERE,
+    AND ROWS ARE WRITTEN THROUGH THE SINGLE Sqlite WORKER
+    :param docs: ITERABLE OF DOCUMENTS
+    :param processes: NUMBER OF FLATTENING PROCESSES (DEFAULT IS ONE PER CPU)
+    :param chunk_size: NUMBER OF DOCUMENTS SENT TO A PROCESS AT A TIME
+    :return: INGEST STATISTICS, SAME AS insert_stream()
+    """
+    start = time()
+    stats = {"docs": 0, "batches": 0, "rows": {}, "elapsed": 0}
+    processes = processes or os.cpu_count() or 1
+    snapshot = None  # (version, ColumnIndex) SENT TO THE PROCESSES
+    nest_version = -1  # CHUNKS FLATTENED AGAINST AN OLDER SCHEMA MUST BE FLATTENED AGAIN
+
+    if not self.namespace.find_snowflake(self.name):
+        self.container.get_or_create_facts(self.name)
+
+    def chunks():
+        chunk = []
+        for doc in docs:
+            if is_dataclass(doc):
+                doc = {k: v for k, v in doc.__dict__.items() if exists(v)}
+            chunk.append(doc)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def submit(pool, chunk):
+        nonlocal snapshot
+        version = self.namespace.columns.version
+        if snapshot is None or snapshot[0] != version:
+            snapshot = version, ColumnIndex(self.snowflake)
+        return chunk, version, pool.submit(_flatten_chunk, self.name, chunk, snapshot[1], version)
+
+    def write(chunk, version, result):
+        nonlocal nest_version
+        doc_actions, required_changes, num_uids = result
+        if version < nest_version or any("nest" in change for change in required_changes):
+            # TABLES CHANGED SHAPE, THE PROCESS COULD NOT KNOW WHERE ROWS GO
+            doc_actions = self.flatten_many(chunk)
+            nest_version = self.namespace.columns.version
+        else:
+            snowflake = self.snowflake
+            existing = {(c.es_index, c.es_column) for c in snowflake.columns}
+            required_changes = [
+                change
+                for change in required_changes
+                if (change["add"].es_index, change["add"].es_column) not in existing
+            ]
+            if required_changes:
+                now = Date.now()
+                for change in required_changes:
+                    change["add"].last_updated = now
+                snowflake.change_schema(required_changes)
+            _rebase_uids(self.name, doc_actions, self.container.reserve_uids(num_uids).start)
+
+        self._insert(doc_actions)
+        stats["docs"] += len(chunk)
+        stats["batches"] += 1
+        rows = stats["rows"]
+        for table_name, insertion in doc_actions["insert"].items():
+            rows[table_name] = rows.get(table_name, 0) + len(insertion.rows)
+
+    with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(submit(pool, chunk))
+            if len(pending) > 2 * processes:
+                chunk, version, future = pending.popleft()
+                write(chunk, version, future.result())
+        while pending:
+            chunk, version, future = pending.popleft()
+            write(chunk, version, future.result())
+
+    stats["elapsed"] = time() - start
+    return stats
+
+
+_process_shapes = None  # COMPILED FLATTENERS, KEPT FOR THE LIFE OF A POOL PROCESS
+
+
+def _flatten_chunk(fact_name, docs, columns, version):
+    """
+    RUNS IN A POOL PROCESS. ROW IDS START AT ZERO, THE WRITER REBASES THEM
+    :return: (doc_actions, required_changes, number of ids used)
+    """
+    global _process_shapes
+    if _process_shapes is None:
+        _process_shapes = ShapeCache()
+    uids = count()
+    doc_actions, required_changes = flatten_docs(fact_name, docs, columns, uids.__next__, _process_shapes, version)
+    for change in required_changes:
+        for column in change.values():
+            column.last_updated = None  # Date DOES NOT SURVIVE pickle, THE WRITER SETS IT
+    return doc_actions, required_changes, next(uids)
+
+
+def _rebase_uids(fact_name, doc_actions, first_uid):
+    """
+    MOVE THE ZERO-BASED ROW IDS OF A CHUNK TO THE RANGE RESERVED FOR IT
+    """
+    for table_name, insertion in doc_actions["insert"].items():
+        if table_name == fact_name:
+            for row in insertion.rows:
+                row[UID] += first_uid
+        else:
+            for row in insertion.rows:
+                row[UID] += first_uid
+                row[PARENT] += first_uid
+
+
+def _approx_size(value):
+    """
+    CHEAP ESTIMATE OF THE JSON SIZE OF value
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    elif isinstance(value, str):
+        return len(value) + 2
+    elif is_data(value):
+        return sum(len(k) + 4 + _approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return sum(_approx_size(v) + 1 for v in value) + 2
+    elif is_dataclass(value):
+        return _approx_size(value.__dict__)
+    return len(str(value))
+
+
 @extend(Facts)
 def update(self, command):
     """
@@ -275,6 +467,72 @@ def upsert(self, doc, where):
     self.insert([doc])
 
 
+@extend(Facts)
+def upsert_many(self, docs):
+    """
+    REPLACE THE DOCUMENTS WITH THE SAME GUID, OR INSERT THEM IF NEW, IN ONE TRANSACTION
+    :param docs: DOCUMENTS, EACH WITH A GUID; THE LAST OF ANY DUPLICATES WINS
+    """
+    latest = {}
+    for doc in docs:
+        if is_dataclass(doc):
+            doc = {k: v for k, v in doc.__dict__.items() if exists(v)}
+        guid = doc.get(GUID) if is_data(doc) else None
+        if guid is None:
+            logger.error("Expecting {guid} in every document", guid=GUID)
+        latest[guid] = doc
+
+    with self.container.db.transaction():
+        self._insert(self.flatten_many(list(latest.values())))
+    return self
+
+
+@extend(Facts)
+def _delete_guids(self, t, guids):
+    """
+    DELETE THE DOCUMENTS WITH THE GIVEN GUIDS, AND THEIR NESTED ROWS
+    THE GUIDS ARE JOINED THROUGH A TEMP TABLE, SO EACH DELETE IS AN INDEX LOOKUP, NOT A SCAN
+    :param t: THE TRANSACTION TO USE
+    :param guids: THE GUIDS TO DELETE
+    """
+    temp = quote_column(GUID_TABLE)
+    t.execute(ConcatSQL(
+        SQL("CREATE TEMP TABLE IF NOT EXISTS "), temp, sql_iso(quote_column(GUID), SQL(" TEXT PRIMARY KEY")),
+    ))
+    t.execute_many(
+        ConcatSQL(SQL("INSERT OR IGNORE INTO "), temp, sql_iso(quote_column(GUID)), SQL_VALUES, sql_iso(SQL_BIND)),
+        [(guid,) for guid in guids],
+    )
+
+    fact_rows = ConcatSQL(
+        SQL_SELECT, quote_column(UID), SQL_FROM, quote_column(self.name), SQL_WHERE, quote_column(GUID), SQL_IN,
+        sql_iso(SQL_SELECT, quote_column(GUID), SQL_FROM, temp),
+    )
+    query_paths = self.snowflake.query_paths
+    for query_path in sorted(query_paths, key=len, reverse=True):
+        if query_path == self.name:
+            continue
+        # WALK UP TO THE FACT TABLE, DEEPEST FIRST
+        parents = sorted(
+            (p for p in query_paths if p != query_path and startswith_field(query_path, p)), key=len, reverse=True
+        )
+        rows = fact_rows
+        for parent in reversed(parents[:-1]):
+            rows = ConcatSQL(
+                SQL_SELECT, quote_column(UID), SQL_FROM, quote_column(parent), SQL_WHERE, quote_column(PARENT), SQL_IN,
+                sql_iso(rows),
+            )
+        t.execute(ConcatSQL(
+            SQL_DELETE, SQL_FROM, quote_column(query_path), SQL_WHERE, quote_column(PARENT), SQL_IN, sql_iso(rows),
+        ))
+
+    t.execute(ConcatSQL(
+        SQL_DELETE, SQL_FROM, quote_column(self.name), SQL_WHERE, quote_column(GUID), SQL_IN,
+        sql_iso(SQL_SELECT, quote_column(GUID), SQL_FROM, temp),
+    ))
+    t.execute(ConcatSQL(SQL_DELETE, SQL_FROM, temp))
+
+
 @extend(Facts)
 def flatten_many(self, docs):
     """
@@ -286,12 +544,41 @@ def flatten_many(self, docs):
              {"active_columns": list, "rows": list of objects}
     """
 
+    if not self.namespace.find_snowflake(self.name):
+        self.container.get_or_create_facts(self.name)
+    snowflake = self.snowflake
+    doc_actions, required_changes = flatten_docs(
+        self.name,
+        docs,
+        ColumnIndex(snowflake),
+        self.container.next_uid,
+        self.container.shapes,
+        self.namespace.columns.version,
+    )
+
+    # ALL SCHEMA CHANGES FOR THE BATCH, BEFORE ANY ROWS ARE WRITTEN
+    if required_changes:
+        snowflake.change_schema(required_changes)
+
+    return doc_actions
+
+
+def flatten_docs(fact_name, docs, columns, next_uid, shapes, version):
+    """
+    FLATTEN docs WITHOUT TOUCHING THE DATABASE
+    :param fact_name: NAME OF THE FACT TABLE
+    :param docs: THE JSON DOCUMENTS
+    :param columns: ColumnIndex OF THE SNOWFLAKE; NEW COLUMNS ARE ADDED TO IT
+    :param next_uid: FUNCTION RETURNING THE NEXT UNIQUE ROW ID
+    :param shapes: ShapeCache OF COMPILED FLATTENERS
+    :param version: THE ColumnList.version columns WAS BUILT FROM
+    :return: (doc_actions, required_changes) PAIR
+    """
     facts_insertion = Insertion()
-    doc_collection: Dict[str, Insertion] = {self.name: facts_insertion}
+    doc_collection: Dict[str, Insertion] = {fact_name: facts_insertion}
     doc_actions = {"delete": [], "insert": doc_collection}
     # KEEP TRACK OF WHAT TABLE WILL BE MADE (SHORTLY)
     required_changes = []
-    snowflake = self.container.get_or_create_facts(self.name).snowflake
 
     def _flatten(doc, doc_path, nested_path, row, row_num, row_id, parent_id):
         """
@@ -306,7 +593,11 @@ def flatten_many(self, docs):
         """
         table_name = nested_path[0]
         insertion = doc_collection.setdefault(table_name, Insertion())
-        known_columns = snowflake.get_schema(nested_path).columns
+
+        flattener = shapes.get(doc, doc_path, nested_path, columns, version)
+        if flattener:
+            flattener.apply(doc, row, row_id, insertion, _flatten_array)
+            return
 
         if is_data(doc):
             items = [(k, v) for k, v in to_data(doc).leaves()]
@@ -320,18 +611,15 @@ def flatten_many(self, docs):
             if json_type is None:
                 continue
 
-            columns = known_columns + insertion.active_columns
             if json_type == ARRAY:
-                curr_column = first(
-                    cc for cc in columns if cc.json_type in STRUCT and untyped_column(cc.name)[0] == abs_name
-                )
+                curr_column = columns.find_struct(abs_name)
                 if curr_column:
                     deeper_insertion = doc_collection.setdefault(
                         concat_field(curr_column.es_index, curr_column.es_column), Insertion()
                     )
 
             else:
-                curr_column = first(cc for cc in columns if cc.json_type == json_type and cc.name == abs_name)
+                curr_column = columns.find(abs_name, json_type)
 
             if not curr_column:
                 curr_column = Column(
@@ -356,14 +644,15 @@ def flatten_many(self, docs):
                     old_column_prefix, _ = untyped_column(curr_column.es_column)
                     for c in list(insertion.active_columns):
                         if c.nested_path[0] == nested_path[0] and startswith_field(c.es_column, old_column_prefix):
-                            doc_collection[table_name].active_columns.remove(c)
-                            doc_collection[new_query_path].active_columns.append(c)
+                            doc_collection[table_name].deactivate(c)
+                            doc_collection[new_query_path].activate(c)
                     insertion.query_paths.append(curr_column.es_column)
                     required_changes.append({"nest": curr_column})
                 else:
                     required_changes.append({"add": curr_column})
 
-                insertion.active_columns.append(curr_column)
+                columns.add(curr_column)
+                insertion.activate(curr_column)
 
             elif curr_column.json_type == ARRAY and json_type == OBJECT:
                 # ALWAYS PROMOTE OBJECTS TO NESTED
@@ -381,16 +670,16 @@ def flatten_many(self, docs):
                         )
 
                         row1 = {
-                            UID: self.container.next_uid(),
+                            UID: next_uid(),
                             PARENT: r[UID],
                             ORDER: 0,
                             deeper_es_column: r[es_column],
                         }
                         insertion.rows.append(row1)
             elif len(curr_column.nested_path) > len(nested_path):
-                insertion = doc_collection[curr_column.nested_path[0]]
+                insertion = doc_collection.setdefault(curr_column.nested_path[0], Insertion())
                 row = {
-                    UID: self.container.next_uid(),
+                    UID: next_uid(),
                     PARENT: row_id,
                     ORDER: row_num,
                 }
@@ -398,24 +687,9 @@ def flatten_many(self, docs):
 
             # BE SURE TO NEST VALUES, IF NEEDED
             if json_type == ARRAY:
-                for child_row_num, child_data in enumerate(v):
-                    child_uid = self.container.next_uid()
-                    child_row = {
-                        UID: child_uid,
-                        PARENT: row_id,
-                        ORDER: child_row_num,
-                    }
-                    deeper_insertion.rows.append(child_row)
-
-                    _flatten(
-                        doc=child_data,
-                        doc_path=abs_name,
-                        nested_path=[concat_field(curr_column.es_index, curr_column.es_column), *nested_path],
-                        row=child_row,
-                        row_num=child_row_num,
-                        row_id=child_uid,
-                        parent_id=row_id,
-                    )
+                _flatten_array(
+                    v, (abs_name, [concat_field(curr_column.es_index, curr_column.es_column), *nested_path]), row_id
+                )
             elif json_type == OBJECT:
                 _flatten(
                     doc=v,
@@ -427,11 +701,36 @@ def flatten_many(self, docs):
                     parent_id=parent_id,
                 )
             elif curr_column.json_type:
-                if curr_column not in insertion.active_columns:
-                    known_columns.remove(curr_column)
-                    insertion.active_columns.append(curr_column)
+                insertion.activate(curr_column)
                 row[curr_column.es_column] = v
 
+    def _flatten_array(values, array, row_id):
+        """
+        :param values: the array elements
+        :param array: (doc_path, nested_path) pair for the elements
+        :param row_id: the id of the row holding the array
+        """
+        doc_path, nested_path = array
+        deeper_insertion = doc_collection.setdefault(nested_path[0], Insertion())
+        for child_row_num, child_data in enumerate(values):
+            child_uid = next_uid()
+            child_row = {
+                UID: child_uid,
+                PARENT: row_id,
+                ORDER: child_row_num,
+            }
+            deeper_insertion.rows.append(child_row)
+
+            _flatten(
+                doc=child_data,
+                doc_path=doc_path,
+                nested_path=nested_path,
+                row=child_row,
+                row_num=child_row_num,
+                row_id=child_uid,
+                parent_id=row_id,
+            )
+
     guids = doc_actions["delete"]
     for doc in docs:
         if is_dataclass(doc):
@@ -447,17 +746,14 @@ def flatten_many(self, docs):
                 guid = str(uuid4())
         else:
             guid = str(uuid4())
-        uid = self.container.next_uid()
+        uid = next_uid()
         row = {GUID: guid, UID: uid}
         facts_insertion.rows.append(row)
         _flatten(
-            doc=doc, doc_path=".", nested_path=[self.name], row=row, row_num=0, row_id=uid, parent_id=0,
+            doc=doc, doc_path=".", nested_path=[fact_name], row=row, row_num=0, row_id=uid, parent_id=0,
         )
-        if required_changes:
-            snowflake.change_schema(required_changes)
-            required_changes = []
 
-    return doc_actions
+    return doc_actions, required_changes
 
 
 @extend(Facts)
@@ -465,13 +761,15 @@ def _insert(self, doc_actions):
     with self.container.db.transaction() as t:
 
         if doc_actions["delete"]:
-            self.delete({"in": {GUID: doc_actions["delete"]}})
+            self._delete_guids(t, doc_actions["delete"])
 
         collection = doc_actions["insert"]
         for nested_path, insertion in collection.items():
             column_names = [c.es_column for c in insertion.active_columns if c.json_type != ARRAY]
             rows = insertion.rows
             table_name = nested_path
+            if not rows:
+                continue
 
             if table_name == self.name:
                 # DO NOT REQUIRE PARENT OR ORDER COLUMNS
@@ -480,6 +778,14 @@ def _insert(self, doc_actions):
                 meta_columns = [UID, PARENT, ORDER]
 
             all_columns = tuple(meta_columns + column_names)
+            if self.container.bulk_insert:
+                # ONE PREPARED STATEMENT PER TABLE, sqlite3 BINDS THE VALUES
+                t.execute_many(
+                    sql_insert_params(table_name, all_columns),
+                    [tuple(bind_value(row.get(c)) for c in all_columns) for row in rows],
+                )
+                continue
+
             command = ConcatSQL(
                 SQL_INSERT,
                 quote_column(table_name),
@@ -496,3 +802,96 @@ class Insertion:
         self.active_columns = []
         self.rows: List[Dict] = []
         self.query_paths: List[str] = []  # CHILDREN ARRAYS
+        self._active = set()  # id() OF active_columns, Column EQUALITY IS TOO EXPENSIVE
+        self.shapes = set()  # id() OF THE COMPILED FLATTENERS THAT ACTIVATED THEIR COLUMNS
+
+    def activate(self, column):
+        if id(column) in self._active:
+            return
+        self._active.add(id(column))
+        self.active_columns.append(column)
+
+    def deactivate(self, column):
+        self._active.discard(id(column))
+        self.active_columns.remove(column)
+
+
+class ColumnIndex:
+    """
+    THE SNOWFLAKE COLUMNS, INDEXED FOR THE FLATTENER
+    COLUMNS ADDED DURING THE BATCH MUST BE add()ED, SO LATER DOCUMENTS FIND THEM
+    """
+
+    def __init__(self, snowflake):
+        self.by_type = {}  # MAP FROM (name, json_type) TO COLUMN
+        self.by_struct = {}  # MAP FROM UNTYPED name TO STRUCT COLUMN
+        self.pending = set()  # id() OF COLUMNS NOT IN THE DATABASE YET
+        for c in snowflake.columns:
+            self._index(c)
+
+        # THE NESTED TABLES ARE NOT COLUMNS OF THE SNOWFLAKE, BUT THE FLATTENER LOOKS FOR THEM
+        query_paths = snowflake.query_paths
+        now = Date.now()
+        for query_path in query_paths:
+            parents = sorted(
+                (p for p in query_paths if p != query_path and startswith_field(query_path, p)), key=len, reverse=True,
+            )
+            if not parents:
+                continue
+            self._index(Column(
+                name=untype_field(relative_field(query_path, snowflake.fact_name))[0],
+                json_type=ARRAY,
+                es_type=json_type_to_sqlite_type.get(ARRAY, ARRAY),
+                es_column=relative_field(query_path, parents[0]),
+                es_index=parents[0],
+                cardinality=0,
+                multi=1,
+                nested_path=parents,
+                last_updated=now,
+            ))
+
+    def add(self, column):
+        """
+        ADD A COLUMN MADE DURING THIS BATCH
+        """
+        self.pending.add(id(column))
+        self._index(column)
+
+    def _index(self, column):
+        # FIRST COLUMN WINS, SAME AS THE LINEAR SEARCH THIS REPLACES
+        if column.json_type in STRUCT:
+            self.by_struct.setdefault(untyped_column(column.name)[0], column)
+        self.by_type.setdefault((column.name, column.json_type), column)
+
+    def __getstate__(self):
+        # Column (WITH ITS Null AND Date PROPERTIES) DOES NOT SURVIVE pickle, SO SEND PLAIN DATA
+        columns, index = [], {}
+
+        def ref(column):
+            i = index.get(id(column))
+            if i is None:
+                i = index[id(column)] = len(columns)
+                columns.append({
+                    **{k: v if exists(v) else None for k, v in column.items()},
+                    "last_updated": None,  # NOT NEEDED TO FLATTEN
+                })
+            return i
+
+        return {
+            "by_type": [(key, ref(c)) for key, c in self.by_type.items()],
+            "by_struct": [(key, ref(c)) for key, c in self.by_struct.items()],
+            "pending": [index[i] for i in self.pending if i in index],
+            "columns": columns,
+        }
+
+    def __setstate__(self, state):
+        columns = [Column(**c) for c in state["columns"]]
+        self.by_type = {key: columns[i] for key, i in state["by_type"]}
+        self.by_struct = {key: columns[i] for key, i in state["by_struct"]}
+        self.pending = {id(columns[i]) for i in state["pending"]}
+
+    def find(self, name, json_type):
+        return self.by_type.get((name, json_type))
+
+    def find_struct(self, name):
+        return self.by_struct.get(name)
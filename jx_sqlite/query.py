@@ -33,6 +33,7 @@ from mo_sqlite import (
     SQL_COMMA,
 )
 from mo_sqlite import quote_column, sql_alias
+from mo_sqlite.deadline import deadline
 from mo_threads import register_thread
 
 
@@ -98,12 +99,16 @@ def where(self, filter):
 
 
 @extend(Facts)
-def query(self, query=None):
+def query(self, query=None, stream=False, timeout=None, till=None):
     """
     :param query:  JSON Query Expression, SET `format="container"` TO MAKE NEW TABLE OF RESULT
+    :param stream: SET True TO GET A StreamResult, WITH data PULLED FROM THE DATABASE AS IT IS ITERATED
+    :param timeout: SECONDS BEFORE THE QUERY IS ABANDONED, OR INTERRUPTED IF RUNNING
+    :param till: Signal TO ABANDON, OR INTERRUPT, THE QUERY
     :return:
     """
     query = query or {}
+    till = deadline(timeout, till)
 
     # SIMPLISITC INSERTION OF FACTS INTO QUERY
     frum = query.get("from", self.name)
@@ -128,15 +133,18 @@ def query(self, query=None):
     elif normalized_query.edges or any(t.aggregate is not NULL for t in listwrap(normalized_query.select.terms)):
         command, index_to_columns = self._edges_op(normalized_query, normalized_query.frum.schema)
     else:
-        return self._set_op(normalized_query)
+        return self._set_op(normalized_query, stream=stream, till=till)
 
     if query.format == "container":
         new_table = "temp_" + unique_name()
         create_table = SQL_CREATE + quote_column(new_table) + SQL_AS
-        self.container.db.query(create_table + command)
+        self.container.db.query(create_table + command, till=till)
         return Facts(new_table, container=self.container)
 
-    result = self.container.db.query(command)
+    if stream:
+        result = self.container.db.query_stream(command, till=till)
+    else:
+        result = self.container.db.query(command, till=till)
 
     return format_flat(result, normalized_query, index_to_columns)
 
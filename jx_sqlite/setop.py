@@ -64,6 +64,7 @@ from mo_sqlite import quote_column, sql_alias
 from mo_sqlite.expressions import SqlVariable, SqlOrderByOp, SqlEqOp, SqlAliasOp, SqlLimitOp, SqlGtOp
 from mo_sqlite.expressions.sql_and_op import SqlAndOp
 from mo_sqlite.expressions.sql_script import SqlScript
+from mo_sqlite.stream import StreamResult
 from mo_times import Date
 
 
@@ -86,9 +87,12 @@ class DocumentDetails:
 
 
 @extend(Facts)
-def _set_op(self, query):
+def _set_op(self, query, stream=False, till=None):
     index_to_column, command, primary_doc_details = to_sql(self, query)
-    result = self.container.db.query(command)
+    if stream:
+        result = self.container.db.query_stream(command, till=till)
+    else:
+        result = self.container.db.query(command, till=till)
 
     def _accumulate_nested(
         rows,  # row generator
@@ -141,6 +145,25 @@ def _set_op(self, query):
 
     cols = tuple(i for i in index_to_column.values() if i.push_list_name != None)
 
+    # the above returns data relative to snowflake.fact_name.  Get the nested_path
+    rel_path = untype_field(relative_field(query.frum.nested_path[0], query.frum.schema.snowflake.fact_name))[0]
+
+    if stream and rel_path == ".":
+
+        def documents():
+            # ONE TOP-LEVEL DOCUMENT AT A TIME: ITS ROWS SHARE THE SAME UID
+            rows = iter(result.data)
+            id_coord = primary_doc_details.id_coord
+            row = next(rows, None)
+            while row:
+                next_row, _, docs = _accumulate_nested(rows, row, None, primary_doc_details, row[id_coord], id_coord)
+                yield docs[0] if docs else Null
+                row = next_row
+
+        return format_deep(StreamResult(result.meta, None, documents(), result), cols, query)
+    elif stream:
+        result = Data(meta=result.meta, header=result.header, data=list(result.data))
+
     if result.data:
         all_rows = iter(result.data)
         first_row = next(all_rows)
@@ -148,8 +171,6 @@ def _set_op(self, query):
     else:
         data = result.data
 
-    # the above returns data relative to snowflake.fact_name.  Get the nested_path
-    rel_path = untype_field(relative_field(query.frum.nested_path[0], query.frum.schema.snowflake.fact_name))[0]
     if rel_path != ".":
         data = list_to_data(data).get(rel_path)
 
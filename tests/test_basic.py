@@ -10,14 +10,17 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from jx_base.expressions import Literal
 from jx_sqlite import Container
 from mo_files import File
 from mo_logs import logger
 from mo_math import randoms
+from mo_sql import ConcatSQL, SQL
 from mo_sql.utils import GUID, UID
-from mo_sqlite import Sqlite
+from mo_sqlite import Sqlite, sql_params
 from mo_testing.fuzzytestcase import add_error_reporting, FuzzyTestCase, StructuredLogger_usingList
-from mo_threads import Thread, join_all_threads
+from mo_threads import Signal, Thread, Till, join_all_threads
+from mo_times import Date, Timer
 
 
 @add_error_reporting
@@ -191,4 +194,357 @@ class TestBasic(FuzzyTestCase):
         db = Sqlite()
         container = Container(db).get_or_create_facts("temp")
 
-        self.assertIn("temp", db.get_tables().name)
\ No newline at end of file
+        self.assertIn("temp", db.get_tables().name)
+    def test_bulk_insert_matches_literal_insert(self):
+        docs = [
+            {"a": 1, "b": "it's", "c": True, "d": Date("2024-01-02")},
+            {"a": 2.5, "c": False, "e": [{"f": 1}, {"f": "two"}]},
+        ]
+        results = []
+        for bulk_insert in [False, True]:
+            db = Sqlite()
+            Container(db, bulk_insert=bulk_insert).get_or_create_facts("my_table").insert(docs)
+            with db.transaction() as t:
+                facts = t.query('SELECT * FROM "my_table"', raw=True)
+                nested = t.query('SELECT * FROM "my_table.e.$A"', raw=True)
+            results.append((facts.header, [r[2:] for r in facts.data], nested.header, [r[2:] for r in nested.data]))
+            db.stop()
+        self.assertEqual(results[0], results[1])
+
+    def test_schema_changes_in_one_transaction(self):
+        sink = StructuredLogger_usingList()
+        logger.main_log, old_log = sink, logger.main_log
+        try:
+            db = Sqlite(debug=True)
+            table = Container(db).get_or_create_facts("my_table")
+            del sink.lines[:]
+            table.insert([{f"p{i}": i, "a": {f"q{i}": str(i)}} for i in range(20)])
+            alter_commands = [line for line in sink.lines if "ALTER TABLE" in line]
+            begin_commands = [line for line in sink.lines if "BEGIN" in line]
+        finally:
+            logger.main_log = old_log
+
+        self.assertEqual(len(alter_commands), 40)
+        self.assertEqual(len(begin_commands), 3)  # ONE FOR UIDS, ONE FOR SCHEMA, ONE FOR DATA
+        self.assertEqual(len(db.about("my_table")), 42)
+        db.stop()
+
+    def test_compiled_flattener_matches_generic(self):
+        docs = [
+            {"a": 1, "b": "it's", "c": {"d": 1.5, "e": [{"f": 1}, {"f": 2}]}},
+            {"a": 2, "b": "", "c": {"d": float("nan"), "e": []}},
+            {"a": 3, "b": None, "c": {"d": 2.5, "e": [{"f": "three"}]}},
+        ]
+        results = []
+        for shape_cache_size in [0, 1000]:
+            db = Sqlite()
+            table = Container(db, shape_cache_size=shape_cache_size).get_or_create_facts("my_table")
+            table.insert(docs)
+            table.insert(docs)  # SECOND TIME, THE SCHEMA EXISTS AND THE SHAPES CAN BE COMPILED
+            with db.transaction() as t:
+                facts = t.query('SELECT * FROM "my_table" ORDER BY 1', raw=True)
+                nested = t.query('SELECT * FROM "my_table.c.e.$A" ORDER BY 1', raw=True)
+            results.append((facts.header, [r[2:] for r in facts.data], nested.header, [r[2:] for r in nested.data]))
+            db.stop()
+        self.assertEqual(results[0], results[1])
+
+    def test_shape_cache(self):
+        db = Sqlite()
+        container = Container(db, shape_cache_size=2)
+        table = container.get_or_create_facts("my_table")
+        table.insert([{"a": 1}, {"b": "x"}, {"a": 2, "b": "y"}])
+        container.shapes.clear()
+
+        table.insert([{"a": 1}, {"a": 2}, {"a": 3}])
+        self.assertEqual(container.shapes.stats(), {"size": 1, "hits": 2, "misses": 1, "evictions": 0})
+
+        table.insert([{"b": "x"}, {"a": 2, "b": "y"}])
+        self.assertEqual(container.shapes.stats(), {"size": 2, "hits": 2, "misses": 3, "evictions": 1})
+        db.stop()
+
+    def test_reserve_uids(self):
+        db = Sqlite()
+        container = Container(db, uid_block_size=10)
+        first_uid = container.next_uid()
+        reserved = container.reserve_uids(100)
+        self.assertEqual(len(reserved), 100)
+        self.assertNotIn(first_uid, reserved)
+        rest = [container.next_uid() for _ in range(20)]
+        self.assertEqual(len(set(rest) | set(reserved) | {first_uid}), 121)
+        db.stop()
+
+    def test_uids_from_rolled_back_transaction(self):
+        db = Sqlite()
+        container = Container(db, uid_block_size=10)
+        try:
+            with db.transaction():
+                lost = container.next_uid()
+                raise Exception("rollback")
+        except Exception:
+            pass
+        uid = container.next_uid()
+        self.assertGreater(uid, lost + 9)  # THE REST OF THE BLOCK IS NOT USED
+        next_id = db.query('SELECT next_id FROM "meta.about"').data[0][0]
+        self.assertGreater(next_id, uid)
+        db.stop()
+
+    def test_uids_per_thread(self):
+        db = Sqlite()
+        container = Container(db, uid_block_size=10)
+        results = {}
+
+        def take(name, please_stop):
+            results[name] = [container.next_uid() for _ in range(25)]
+
+        threads = [Thread.run(f"uid {i}", take, i) for i in range(4)]
+        for t in threads:
+            t.join()
+        uids = [u for r in results.values() for u in r]
+        self.assertEqual(len(set(uids)), 100)
+        # EACH THREAD COUNTS UP THROUGH ITS OWN BLOCK
+        for r in results.values():
+            self.assertEqual(r[:10], list(range(r[0], r[0] + 10)))
+        db.stop()
+
+    def test_guid_is_unique(self):
+        db = Sqlite()
+        table = Container(db).get_or_create_facts("my_table")
+        indexes = db.query("SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name='my_table'").data
+        self.assertIn("UNIQUE", " ".join(sql for _, sql in indexes if sql))
+
+        table.insert([{"_id": "a", "v": 1}])
+        table.insert([{"_id": "a", "v": 2}])  # REPLACES THE FIRST
+        self.assertEqual(db.query('SELECT "v.$N" FROM "my_table"').data, [(2,)])
+        db.stop()
+
+    def test_parent_indexes(self):
+        db = Sqlite()
+        table = Container(db).get_or_create_facts("my_table")
+        table.insert([{"_id": "x", "a": 1, "b": [{"c": 1, "d": [1, 2]}]}])
+        table.insert([{"_id": "y", "a": [1, 2]}])  # REBUILDS THE FACT TABLE
+
+        def indexes():
+            return db.query("SELECT name FROM sqlite_master WHERE type='index' AND sql IS NOT NULL ORDER BY 1").data
+
+        expected = [
+            ("my_table._id",),
+            ("my_table.a.$A.__parent__.__order__",),
+            ("my_table.b.$A.__parent__.__order__",),
+            ("my_table.b.$A.d.$A.__parent__.__order__",),
+        ]
+        self.assertEqual(indexes(), expected)
+        plan = db.query(
+            'EXPLAIN QUERY PLAN SELECT * FROM "my_table.b.$A" c JOIN "my_table" p ON c.__parent__=p.__id__'
+            " WHERE p._id='x'"
+        ).data
+        self.assertIn("my_table.b.$A.__parent__.__order__", " ".join(str(p) for p in plan))
+
+        # OLDER DATABASES ARE MIGRATED WHEN OPENED
+        for (name,) in expected:
+            db.query(f'DROP INDEX "{name}"')
+        Container(db).get_or_create_facts("my_table")
+        self.assertEqual(indexes(), expected)
+        db.stop()
+
+    def test_promote_column_without_rebuild(self):
+        db = Sqlite()
+        table = Container(db).get_or_create_facts("my_table")
+        table.insert([{"_id": "x", "a": 1}, {"_id": "z", "b": 1}])
+        table_sql = db.query("SELECT sql FROM sqlite_master WHERE name='my_table'").data[0][0]
+        table.insert([{"_id": "y", "a": [2, 3]}])  # a BECOMES NESTED
+        table.insert([{"_id": "w", "a": 5}, {"_id": "v", "a": [6, 7]}])
+
+        # FACT TABLE IS NOT REBUILT: SAME PRIMARY KEY, SAME INDEX, OLD COLUMN RETIRED IN PLACE
+        new_sql = db.query("SELECT sql FROM sqlite_master WHERE name='my_table'").data[0][0]
+        self.assertIn("INTEGER PRIMARY KEY", new_sql)
+        self.assertEqual(new_sql, table_sql.replace('"a.$N"', '"__a.$N"'))
+        indexes = db.query("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='my_table'").data
+        self.assertIn(("my_table._id",), indexes)
+
+        values = db.query(
+            'SELECT p._id, c."$N" FROM "my_table.a.$A" c JOIN "my_table" p ON c.__parent__=p.__id__'
+            " WHERE p._id IN ('x', 'z', 'w', 'v') ORDER BY p.__id__, c.__order__"
+        ).data
+        self.assertEqual(values, [("x", 1), ("w", 5), ("v", 6), ("v", 7)])
+        db.stop()
+
+    def test_read_pool(self):
+        db = Sqlite(self._new_file(), read_pool=2)
+        self.assertEqual(db.query("PRAGMA journal_mode").data[0][0], "wal")
+        table = Container(db).get_or_create_facts("my_table")
+        table.insert([{"a": 1}, {"a": 2}])
+
+        holding = Signal("transaction is open")
+        release = Signal("release transaction")
+
+        def writer(please_stop):
+            with db.transaction() as t:
+                t.execute('INSERT INTO "my_table" ("__id__", "a.$N") VALUES (100, 3)')
+                t.query('SELECT COUNT(1) FROM "my_table"')  # ENSURE THE TRANSACTION HAS STARTED
+                holding.go()
+                release.wait()
+
+        thread = Thread.run("writer", writer)
+        holding.wait()
+        # READ DOES NOT WAIT FOR THE OPEN TRANSACTION, AND SEES ONLY COMMITTED ROWS
+        self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], 2)
+        release.go()
+        thread.join()
+        self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], 3)
+        db.stop()
+
+    def test_performance_presets(self):
+        container = Container(db={"filename": self._new_file()}, performance="oltp")
+        db = container.db
+        self.assertEqual(
+            db.get_performance(),
+            {"journal_mode": "wal", "synchronous": 1, "cache_size": -65536, "temp_store": 2, "busy_timeout": 5000},
+        )
+
+        # RELAX DURABILITY FOR A BULK LOAD, THEN RESTORE
+        with db.performance_profile({"preset": "bulk_load", "cache_size": -1000}):
+            self.assertEqual(
+                db.get_performance(), {"journal_mode": "memory", "synchronous": 0, "cache_size": -1000}
+            )
+            container.get_or_create_facts("my_table").insert([{"a": 1}])
+        self.assertEqual(db.get_performance(), {"journal_mode": "wal", "synchronous": 1, "cache_size": -65536})
+
+        with self.assertRaises(Exception):
+            db.set_performance("fastest")
+        with self.assertRaises(Exception):
+            db.set_performance({"locking_mode": "EXCLUSIVE"})
+        db.stop()
+
+    def test_bound_parameters(self):
+        db = Sqlite()
+        with db.transaction() as t:
+            t.execute('CREATE TABLE "my_table" (a INTEGER, b TEXT)')
+            for i in range(10):
+                t.execute('INSERT INTO "my_table" VALUES (?, ?)', (i, f"it's {i}"))
+            self.assertEqual(t.query('SELECT b FROM "my_table" WHERE a=?', (3,), raw=True).data, [("it's 3",)])
+
+        # LITERALS BECOME PARAMETERS, SO THE SQL TEXT IS THE SAME FOR EVERY VALUE
+        before = db.statement_cache_stats()
+        texts = set()
+        for i in range(10):
+            sql = ConcatSQL(SQL('SELECT b FROM "my_table" WHERE a='), Literal(i), SQL(" AND b<>"), Literal("x"))
+            command, params = sql_params(sql)
+            texts.add(command)
+            self.assertEqual(db.query(command, params).data, [(f"it's {i}",)])
+        self.assertEqual(len(texts), 1)
+        self.assertIn("'x'", str(sql))  # WITHOUT sql_params, LITERALS ARE STILL SQL TEXT
+
+        after = db.statement_cache_stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 9)
+        self.assertGreater(after["hit_rate"], 0)
+        self.assertEqual(after["max_size"], 128)
+        db.stop()
+
+    def test_query_stream(self):
+        db = Sqlite()
+        db.query('CREATE TABLE "my_table" (a INTEGER)')
+        db.query(
+            'INSERT INTO "my_table" SELECT x FROM'
+            " (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x+1 FROM c WHERE x<2500) SELECT x FROM c)"
+        )
+
+        result = db.query_stream('SELECT a FROM "my_table" ORDER BY a', chunk_size=100)
+        self.assertEqual(result.header, ["a"])
+        self.assertEqual([a for (a,) in result], list(range(1, 2501)))
+
+        # STOPPING EARLY FREES THE CONNECTION
+        with db.query_stream('SELECT a FROM "my_table" ORDER BY a', chunk_size=100) as result:
+            self.assertEqual(next(iter(result)), (1,))
+        with db.query_stream('SELECT a FROM "my_table"'):
+            pass  # NEVER STARTED
+        self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data, [(2500,)])
+
+        with self.assertRaises(Exception):
+            db.query_stream('SELECT a FROM "not_a_table"')
+        db.stop()
+
+    def test_query_stream_from_read_pool(self):
+        db = Sqlite(self._new_file(), read_pool=1)
+        db.query('CREATE TABLE "my_table" (a INTEGER)')
+        db.query(
+            'INSERT INTO "my_table" SELECT x FROM'
+            " (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x+1 FROM c WHERE x<500) SELECT x FROM c)"
+        )
+
+        # WRITER IS FREE WHILE THE READER STREAMS
+        with db.query_stream('SELECT a FROM "my_table" ORDER BY a', chunk_size=10) as result:
+            rows = iter(result)
+            self.assertEqual(next(rows), (1,))
+            db.query('INSERT INTO "my_table" VALUES (501)')
+            self.assertEqual(sum(1 for _ in rows), 499)
+        self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data, [(501,)])
+        db.stop()
+
+    def test_query_deadline(self):
+        db = Sqlite()
+        runaway = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x+1 FROM c) SELECT COUNT(1) FROM c"
+
+        with Timer("runaway query") as timer:
+            with self.assertRaises("deadline"):
+                db.query(runaway, timeout=0.2)
+        self.assertLess(timer.duration.seconds, 5)
+
+        please_stop = Signal()
+        timer = Till(seconds=0.2)
+        timer.then(please_stop.go)
+        with self.assertRaises("deadline"):
+            db.query(runaway, till=please_stop)
+
+        # WORKER IS STILL USABLE
+        self.assertEqual(db.query("SELECT 1", timeout=10).data, [(1,)])
+
+        # A QUERY WAITING BEHIND ANOTHER THREAD'S TRANSACTION IS ABANDONED
+        holding = Signal("transaction is open")
+        release = Signal("release transaction")
+
+        def writer(please_stop):
+            with db.transaction() as t:
+                t.query("SELECT 1")
+                holding.go()
+                release.wait()
+
+        thread = Thread.run("writer", writer)
+        holding.wait()
+        with self.assertRaises("deadline"):
+            db.query("SELECT 2", timeout=0.2)
+        release.go()
+        thread.join()
+        self.assertEqual(db.query("SELECT 3").data, [(3,)])
+        db.stop()
+
+    def test_group_commit(self):
+        db = Sqlite(self._new_file(), group_commit=10, group_commit_delay=0.5)
+        db.query('CREATE TABLE "my_table" (a INTEGER PRIMARY KEY)')
+        outcome = {}
+
+        def writer(value, please_stop):
+            try:
+                with db.transaction() as t:
+                    t.execute(f'INSERT INTO "my_table" VALUES ({value})')
+                    t.execute(f'INSERT INTO "my_table" VALUES ({value})')  # DUPLICATE WHEN value==2
+                outcome[value] = "committed"
+            except Exception:
+                outcome[value] = "failed"
+
+        def ok_writer(value, please_stop):
+            with db.transaction() as t:
+                t.execute(f'INSERT INTO "my_table" VALUES ({value})')
+            outcome[value] = "committed"
+
+        threads = [
+            Thread.run("writer 1", ok_writer, 1),
+            Thread.run("writer 2", writer, 2),
+            Thread.run("writer 3", ok_writer, 3),
+        ]
+        join_all_threads(threads)
+
+        # ONE FAILURE DOES NOT POISON THE REST OF THE GROUP
+        self.assertEqual(outcome, {1: "committed", 2: "failed", 3: "committed"})
+        self.assertEqual(db.query('SELECT a FROM "my_table" ORDER BY a').data, [(1,), (3,)])
+        db.stop()
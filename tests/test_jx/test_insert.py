@@ -56,6 +56,81 @@ class TestInsert(BaseTestCase):
                 ]
             )
 
+    def test_insert_stream(self):
+        def docs():
+            for i in range(25):
+                yield {"v": i, "a": [{"b": i}, {"b": -i}]}
+
+        stats = self.utils.table.insert_stream(docs(), batch_size=10)
+        name = self.utils.table.name
+        self.assertEqual(stats["docs"], 25)
+        self.assertEqual(stats["batches"], 3)
+        self.assertEqual(stats["rows"], {name: 25, name + ".a.$A": 50})
+
+        db = self.utils.container.db
+        with db.transaction() as t:
+            facts = table2list(t.query(sql_query({"from": name}), raw=True))
+            self.assertEqual(len(facts), 25)
+            branches = table2list(t.query(sql_query({"from": name + ".a.$A"}), raw=True))
+            self.assertEqual(len(branches), 50)
+
+    def test_insert_stream_single_transaction(self):
+        docs = ({"v": i, "a": {"_b": [{"c": str(i)}]}} for i in range(7))
+        stats = self.utils.table.insert_stream(docs, batch_size=3, max_bytes=100, single_transaction=True)
+        self.assertEqual(stats["docs"], 7)
+        self.assertGreaterEqual(stats["batches"], 3)
+
+        db = self.utils.container.db
+        name = self.utils.table.name
+        with db.transaction() as t:
+            branches = table2list(t.query(sql_query({"from": name + ".a._b.$A"}), raw=True))
+            self.assertAlmostEqual(sorted(b["c.$S"] for b in branches), [str(i) for i in range(7)])
+
+    def test_insert_parallel(self):
+        docs = [{"v": i, "a": [{"b": i}, {"b": str(-i)}]} for i in range(25)]
+        docs.append({"v": "late", "c": [1, 2]})  # NEW NESTED TABLE, FLATTENED BY THE WRITER
+        docs.extend({"v": i, "d": i / 2} for i in range(25, 35))  # NEW COLUMN, FROM A PROCESS
+        stats = self.utils.table.insert_parallel(docs, processes=2, chunk_size=4)
+        name = self.utils.table.name
+        self.assertEqual(stats["docs"], 36)
+        self.assertEqual(stats["batches"], 9)
+        self.assertEqual(stats["rows"], {name: 36, name + ".a.$A": 50, name + ".c.$A": 2})
+
+        db = self.utils.container.db
+        with db.transaction() as t:
+            facts = table2list(t.query(f'SELECT * FROM "{name}"', raw=True))
+            self.assertEqual(len(set(f["__id__"] for f in facts)), 36)
+            self.assertEqual(sorted(f["d.$N"] for f in facts if f["d.$N"]), [i / 2 for i in range(25, 35)])
+            branches = table2list(t.query(f'SELECT * FROM "{name}.a.$A"', raw=True))
+            parents = {f["__id__"]: f["v.$N"] for f in facts}
+            self.assertEqual(
+                sorted((parents[b["__parent__"]], b["b.$N"] or 0, b["b.$S"] or "") for b in branches),
+                sorted([(i, i, "") for i in range(25)] + [(i, 0, str(-i)) for i in range(25)]),
+            )
+    def test_upsert_many(self):
+        table = self.utils.table
+        name = table.name
+        table.insert([{"_id": str(i), "v": i, "a": [{"b": i, "c": [i, i]}, {"b": -i}]} for i in range(5)])
+        table.upsert_many([
+            {"_id": "1", "v": 10, "a": [{"b": 100}]},
+            {"_id": "9", "v": 9},
+            {"_id": "1", "v": 11, "a": [{"b": 111, "c": [3]}]},  # LAST ONE WINS
+        ])
+
+        db = self.utils.container.db
+        with db.transaction() as t:
+            facts = {f["_id"]: f for f in table2list(t.query(f'SELECT * FROM "{name}"', raw=True))}
+            self.assertEqual(sorted(facts.keys()), ["0", "1", "2", "3", "4", "9"])
+            self.assertEqual(facts["1"]["v.$N"], 11)
+            branches = table2list(t.query(f'SELECT * FROM "{name}.a.$A"', raw=True))
+            self.assertEqual([b["b.$N"] for b in branches if b["__parent__"] == facts["1"]["__id__"]], [111])
+            leaves = table2list(t.query(f'SELECT * FROM "{name}.a.$A.c.$A"', raw=True))
+            self.assertEqual(len(leaves), 4 * 2 + 1)  # NO ORPHANS LEFT BEHIND
+
+    def test_upsert_many_requires_guid(self):
+        with self.assertRaises(Exception):
+            self.utils.table.upsert_many([{"v": 1}])
+
 
 def table2list(table):
     return [{h: v for h, v in zip(table.header, row)} for row in table.data]
@@ -0,0 +1,249 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import tracemalloc
+
+from jx_sqlite import Container
+from mo_files import File
+from mo_logs import logger
+from mo_math import randoms
+from mo_math.stats import percentile
+from mo_sqlite import Sqlite
+from mo_testing.fuzzytestcase import add_error_reporting, FuzzyTestCase
+from mo_threads import Thread, Till
+from mo_times import Timer
+
+NUM_DOCS = 5000
+
+
+def sample_docs(num, offset=0):
+    return [
+        {"a": i, "b": str(i), "c": {"d": i * 1.5, "e": [{"f": i}, {"f": i + 1}]}}
+        for i in range(offset, offset + num)
+    ]
+
+
+@add_error_reporting
+class TestSpeed(FuzzyTestCase):
+    """
+    THROUGHPUT BENCHMARKS, WITH LOOSE ASSERTIONS SO THEY STILL PASS ON SLOW MACHINES
+    """
+
+    def test_bulk_insert_speed(self):
+        docs = sample_docs(NUM_DOCS)
+        timing = {}
+        for bulk_insert in [False, True]:
+            db = Sqlite()
+            try:
+                facts = Container(db, bulk_insert=bulk_insert).get_or_create_facts("my_table")
+                facts.insert(sample_docs(10, offset=NUM_DOCS))  # ENSURE SCHEMA EXISTS
+                doc_actions = facts.flatten_many(docs)
+                with Timer("insert {num} docs", param={"num": NUM_DOCS}, silent=True) as timer:
+                    facts._insert(doc_actions)
+                timing[bulk_insert] = timer.interval
+
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], NUM_DOCS + 10)
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table.c.e.$A"').data[0][0], 2 * (NUM_DOCS + 10))
+            finally:
+                db.stop()
+
+        logger.info(
+            "literal insert: {literal|round(places=3)} sec, bulk insert: {bulk|round(places=3)} sec",
+            literal=timing[False],
+            bulk=timing[True],
+        )
+        self.assertLess(timing[True], timing[False])
+
+    def test_flatten_wide_documents(self):
+        cost_per_leaf = {}
+        for width in [10, 100, 1000]:
+            db = Sqlite()
+            try:
+                # GENERIC FLATTENER; COMPILED SHAPES ARE MEASURED BELOW
+                facts = Container(db, shape_cache_size=0).get_or_create_facts("my_table")
+                docs = [{f"p{j}": i + j for j in range(width)} for i in range(10000 // width)]
+                facts.insert(docs[:1])  # MEASURE STEADY STATE, NOT SCHEMA CHANGES
+                with Timer("flatten {num} docs", param={"num": len(docs)}, silent=True) as timer:
+                    facts.flatten_many(docs)
+                cost_per_leaf[width] = timer.interval / (len(docs) * width)
+            finally:
+                db.stop()
+
+        logger.info(
+            "flatten cost per leaf (microseconds): {costs|json}",
+            costs={str(w): round(c * 1_000_000, 1) for w, c in cost_per_leaf.items()},
+        )
+        # COST PER LEAF SHOULD NOT GROW WITH DOCUMENT WIDTH
+        self.assertLess(cost_per_leaf[1000], 3 * cost_per_leaf[10])
+
+    def test_compiled_flattener_speed(self):
+        docs = sample_docs(NUM_DOCS)
+        timing = {}
+        for shape_cache_size in [0, 1000]:
+            db = Sqlite()
+            try:
+                facts = Container(db, shape_cache_size=shape_cache_size).get_or_create_facts("my_table")
+                facts.insert(sample_docs(10, offset=NUM_DOCS))  # ENSURE SCHEMA EXISTS
+                with Timer("flatten {num} docs", param={"num": NUM_DOCS}, silent=True) as timer:
+                    facts.flatten_many(docs)
+                timing[shape_cache_size] = timer.interval
+            finally:
+                db.stop()
+
+        logger.info(
+            "generic flatten: {generic|round(places=3)} sec, compiled flatten: {compiled|round(places=3)} sec",
+            generic=timing[0],
+            compiled=timing[1000],
+        )
+        self.assertLess(timing[1000], timing[0])
+
+    def test_parallel_insert_speed(self):
+        timing = {}
+        for processes in [0, 2, 4]:
+            db = Sqlite()
+            try:
+                facts = Container(db).get_or_create_facts("my_table")
+                facts.insert(sample_docs(10, offset=NUM_DOCS))  # ENSURE SCHEMA EXISTS
+                with Timer("insert {num} docs", param={"num": NUM_DOCS}, silent=True) as timer:
+                    if processes:
+                        facts.insert_parallel(sample_docs(NUM_DOCS), processes=processes)
+                    else:
+                        facts.insert_stream(sample_docs(NUM_DOCS))
+                timing[processes] = timer.interval
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], NUM_DOCS + 10)
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table.c.e.$A"').data[0][0], 2 * (NUM_DOCS + 10))
+            finally:
+                db.stop()
+
+        # NO ASSERTION ON SPEED: SCALING DEPENDS ON THE NUMBER OF CORES
+        logger.info(
+            "insert time (seconds) by number of processes: {timing|json}",
+            timing={str(k): round(v, 3) for k, v in timing.items()},
+        )
+
+    def test_replace_speed(self):
+        cost = {}
+        for size in [2_000, 20_000]:
+            db = Sqlite()
+            try:
+                facts = Container(db).get_or_create_facts("my_table")
+                docs = sample_docs(size)
+                for doc in docs:
+                    doc["_id"] = str(doc["a"])
+                facts.insert_stream(docs)
+                replacements = [{**doc, "b": "replaced"} for doc in docs[::size // 500]]
+                with Timer("replace {num} docs", param={"num": len(replacements)}, silent=True) as timer:
+                    facts.upsert_many(replacements)
+                cost[size] = timer.interval
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], size)
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table.c.e.$A"').data[0][0], 2 * size)
+            finally:
+                db.stop()
+
+        logger.info(
+            "replace 500 docs (seconds) by table size: {cost|json}",
+            cost={str(k): round(v, 3) for k, v in cost.items()},
+        )
+        # REPLACING BY INDEX, NOT BY SCAN, SO COST DOES NOT GROW WITH THE TABLE
+        self.assertLess(cost[20_000], 3 * cost[2_000])
+
+    def test_read_latency_during_inserts(self):
+        p99 = {}
+        for read_pool in [0, 4]:
+            db = Sqlite(File(f"sql/test{randoms.hex(4)}.sqlite"), read_pool=read_pool)
+            try:
+                facts = Container(db).get_or_create_facts("my_table")
+                facts.insert(sample_docs(10, offset=NUM_DOCS))  # ENSURE SCHEMA EXISTS
+
+                def inserter(please_stop):
+                    offset = 0
+                    while not please_stop:
+                        facts.insert(sample_docs(2000, offset=offset))
+                        offset += 2000
+
+                thread = Thread.run("inserter", inserter)
+                latencies = []
+                for _ in range(100):
+                    with Timer("read", silent=True) as timer:
+                        db.query('SELECT COUNT(1) FROM "my_table"')
+                    latencies.append(timer.interval)
+                    Till(seconds=0.01).wait()
+                thread.stop().join()
+                p99[read_pool] = percentile(latencies, 0.99)
+            finally:
+                db.stop()
+
+        logger.info(
+            "read p99 latency (milliseconds) during inserts, by read pool size: {p99|json}",
+            p99={str(k): round(v * 1000, 1) for k, v in p99.items()},
+        )
+        # READERS DO NOT QUEUE BEHIND THE WRITER
+        self.assertLess(p99[4], p99[0])
+
+    def test_stream_memory(self):
+        num_rows = 200_000
+        db = Sqlite()
+        try:
+            db.query('CREATE TABLE "my_table" (a INTEGER, b TEXT)')
+            db.query(
+                'INSERT INTO "my_table" SELECT x, \'row \' || x FROM'
+                f" (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x+1 FROM c WHERE x<{num_rows}) SELECT x FROM c)"
+            )
+            peak = {}
+            for stream in [False, True]:
+                tracemalloc.start()
+                try:
+                    if stream:
+                        count = sum(1 for _ in db.query_stream('SELECT * FROM "my_table"'))
+                    else:
+                        count = sum(1 for _ in db.query('SELECT * FROM "my_table"').data)
+                    peak[stream] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                self.assertEqual(count, num_rows)
+        finally:
+            db.stop()
+
+        logger.info(
+            "peak memory (MB) to read {num} rows, fetchall: {all|round(places=1)}, stream: {stream|round(places=1)}",
+            num=num_rows,
+            all=peak[False] / 1_000_000,
+            stream=peak[True] / 1_000_000,
+        )
+        # STREAM HOLDS A FEW CHUNKS, NOT THE WHOLE RESULT
+        self.assertLess(peak[True], peak[False] / 10)
+
+    def test_group_commit_speed(self):
+        num_threads, num_commits = 10, 50
+        commits_per_second = {}
+        for group_commit in [0, 100]:
+            db = Sqlite(File(f"sql/test{randoms.hex(4)}.sqlite"), group_commit=group_commit)
+            try:
+                db.query('CREATE TABLE "my_table" (a INTEGER)')
+
+                def writer(n, please_stop):
+                    for i in range(num_commits):
+                        with db.transaction() as t:
+                            t.execute(f'INSERT INTO "my_table" VALUES ({n * num_commits + i})')
+
+                with Timer("small commits", silent=True) as timer:
+                    threads = [Thread.run(f"writer {n}", writer, n) for n in range(num_threads)]
+                    for thread in threads:
+                        thread.join()
+                commits_per_second[group_commit] = num_threads * num_commits / timer.interval
+                self.assertEqual(db.query('SELECT COUNT(1) FROM "my_table"').data[0][0], num_threads * num_commits)
+            finally:
+                db.stop()
+
+        logger.info(
+            "commits per second from {threads} writers, by group size: {rate|json}",
+            threads=num_threads,
+            rate={str(k): round(v) for k, v in commits_per_second.items()},
+        )
+        self.assertGreater(commits_per_second[100], commits_per_second[0])